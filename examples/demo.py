@@ -4,14 +4,13 @@ Example script showing how to interact with the Talebook MCP Server
 """
 
 import asyncio
-import json
 import sys
 import os
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from server import server
+from mcp_service import mcp_service
 
 async def demonstrate_mcp_server():
     """Demonstrate the MCP server functionality."""
@@ -20,14 +19,26 @@ async def demonstrate_mcp_server():
 
     # List available tools
     print("\n📋 Available Tools:")
-    tools = await server._tool_handler()
-    for tool in tools:
-        print(f"  • {tool.name}: {tool.description}")
+    response = await mcp_service.handle_request({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/list"
+    })
+    for tool in response["result"]["tools"]:
+        print(f"  • {tool['name']}: {tool['description']}")
 
     # Call the get_books_count tool
     print("\n📚 Getting Books Count:")
-    result = await server._call_tool_handler("get_books_count", {})
-    print(f"  Result: {result[0].text}")
+    response = await mcp_service.handle_request({
+        "jsonrpc": "2.0",
+        "id": 2,
+        "method": "tools/call",
+        "params": {
+            "name": "get_books_count",
+            "arguments": {}
+        }
+    })
+    print(f"  Result: {response['result']['content'][0]['text']}")
 
     print("\n✅ Demo completed!")
 
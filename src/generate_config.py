@@ -3,11 +3,12 @@
 配置生成器 - 为MCP客户端生成正确的配置文件
 """
 
-import json
 import os
 import sys
 from pathlib import Path
 
+import orjson
+
 def get_project_root():
     """获取项目根目录的绝对路径"""
     script_dir = Path(__file__).parent.absolute()
@@ -15,17 +16,20 @@ def get_project_root():
 
 def generate_config(project_path: Path, client_type: str = "generic"):
     """生成MCP客户端配置"""
+    server_script = str(project_path / "src" / "server.py")
+    src_path = str(project_path / "src")
+    cwd = str(project_path)
 
     config_templates = {
         "generic": {
             "mcpServers": {
                 "talebook-mcp": {
                     "command": "python",
-                    "args": [str(project_path / "src" / "server.py")],
+                    "args": [server_script],
                     "env": {
-                        "PYTHONPATH": str(project_path / "src")
+                        "PYTHONPATH": src_path
                     },
-                    "cwd": str(project_path),
+                    "cwd": cwd,
                     "disabled": False
                 }
             }
@@ -34,12 +38,12 @@ def generate_config(project_path: Path, client_type: str = "generic"):
             "mcpServers": {
                 "talebook-mcp": {
                     "command": "python",
-                    "args": [str(project_path / "src" / "server.py")],
+                    "args": [server_script],
                     "env": {
-                        "PYTHONPATH": str(project_path / "src"),
+                        "PYTHONPATH": src_path,
                         "LOG_LEVEL": "INFO"
                     },
-                    "cwd": str(project_path),
+                    "cwd": cwd,
                     "disabled": False,
                     "description": "Talebook MCP Server - Provides book management tools",
                     "icon": "📚"
@@ -69,8 +73,7 @@ def main():
         filename = f"generated-{config_type}-config.json"
         filepath = project_root / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        filepath.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
 
         print(f"✅ 已生成 {config_type} 配置: {filename}")
 
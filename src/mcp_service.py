@@ -6,39 +6,131 @@ MCP Service Module
 """
 
 import logging
-import uuid
+import secrets
 from typing import Any, Sequence, Dict, Optional
 
+import fastjsonschema
+import orjson
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# 工具定义（纯dict），导入时构建一次
+_TOOLS_RAW = [
+    {
+        "name": "get_books_count",
+        "description": "Get the current count of books in the collection",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    }
+]
+
+# 静态工具列表结果，直接复用工具定义
+_TOOLS_LIST_RESULT = {"tools": _TOOLS_RAW}
+
+# 工具列表结果恒定，直接使用预编码的JSON
+_TOOLS_LIST_RESULT_JSON = orjson.dumps(_TOOLS_LIST_RESULT)
+
+# 初始化结果的静态部分，每次只需注入新的sessionId
+_INIT_RESULT_STATIC = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "talebook-mcp",
+        "version": "1.0.0"
+    }
+}
+
+# 预编码的初始化结果前缀（去掉末尾的"}"），命中时只需拼接新的sessionId
+_INIT_RESULT_PREFIX_JSON = orjson.dumps(_INIT_RESULT_STATIC)[:-1]
+
+# JSON-RPC请求结构校验器，导入时编译一次
+_validate_request = fastjsonschema.compile({
+    "type": "object",
+    "required": ["jsonrpc", "method"],
+    "properties": {
+        "jsonrpc": {"const": "2.0"},
+        "id": {"type": ["string", "number", "null"]},
+        "method": {"type": "string"},
+        "params": {"type": "object"}
+    }
+})
+
+# 空的批量请求本身就是无效请求，错误响应预先编码
+_EMPTY_BATCH_ERROR_JSON = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": None,
+    "error": {"code": -32600, "message": "Invalid Request: empty batch"}
+})
+
+def _request_id_or_none(request_data: Any) -> Any:
+    """取出请求中合法的id（字符串、数字或null），缺失或不合法时返回None"""
+    if not isinstance(request_data, dict):
+        return None
+    request_id = request_data.get("id")
+    if isinstance(request_id, bool) or not isinstance(request_id, (str, int, float)):
+        return None
+    return request_id
+
+def _invalid_request_error(request_data: Any) -> Optional[Dict[str, Any]]:
+    """校验JSON-RPC请求结构，不合法时返回错误响应"""
+    try:
+        _validate_request(request_data)
+    except fastjsonschema.JsonSchemaException as e:
+        return {
+            "jsonrpc": "2.0",
+            "id": _request_id_or_none(request_data),
+            "error": {"code": -32600, "message": f"Invalid Request: {e.message}"}
+        }
+    return None
+
+class JSONRPCError(Exception):
+    """携带JSON-RPC错误码的异常"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
 class MCPService:
     """MCP协议处理服务类"""
 
+    # Tool模型只需校验一次，所有实例共享
+    _tools = tuple(Tool(**tool) for tool in _TOOLS_RAW)
+
     def __init__(self):
         """初始化MCP服务"""
-        self.server = Server("talebook-mcp")
+        self.server = Server("talebook-mcp", version="1.0.0")
         self._setup_tools()
 
+        # 方法名到处理函数的映射（支持新旧两种方法名）
+        self._method_handlers = {
+            "initialize": self._handle_initialize,
+            "tools/list": self._handle_list_tools,
+            "mcp:list-tools": self._handle_list_tools,
+            "tools/call": self._handle_call_tool,
+            "mcp:call-tool": self._handle_call_tool,
+        }
+
+        # 可直接生成预编码结果的处理函数，按处理函数查找，新旧方法名共用
+        self._result_encoders = {
+            self._handle_initialize: self._encode_initialize_result,
+            self._handle_list_tools: self._encode_list_tools_result,
+        }
+
     def _setup_tools(self):
         """设置工具定义"""
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List available tools."""
-            return [
-                Tool(
-                    name="get_books_count",
-                    description="Get the current count of books in the collection",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                )
-            ]
+            return list(self._tools)
 
         @self.server.call_tool()
         async def call_tool(name: str, arguments: dict[str, Any] | None = None) -> Sequence[TextContent]:
@@ -48,48 +140,62 @@ class MCPService:
             else:
                 raise ValueError(f"Unknown tool: {name}")
 
-    async def get_books_count(self, arguments: dict[str, Any]) -> Sequence[TextContent]:
-        """Get the current count of books in the collection."""
+    async def get_books_count_raw(self, arguments: dict[str, Any]) -> str:
+        """Get the current count of books in the collection as plain text."""
         try:
             books_count = 1
-            result = f"Current books count: {books_count}"
-            logger.info(f"Books count requested, returning: {books_count}")
-            return [TextContent(type="text", text=result)]
+            logger.debug("Books count requested, returning: %s", books_count)
+            return f"Current books count: {books_count}"
         except Exception as e:
             error_msg = f"Error getting books count: {str(e)}"
             logger.error(error_msg)
-            return [TextContent(type="text", text=error_msg)]
+            return error_msg
+
+    async def get_books_count(self, arguments: dict[str, Any]) -> Sequence[TextContent]:
+        """Get the current count of books in the collection."""
+        text = await self.get_books_count_raw(arguments)
+        return [TextContent(type="text", text=text)]
 
     async def list_tools(self) -> list[Tool]:
         """获取可用工具列表"""
-        return [
-            Tool(
-                name="get_books_count",
-                description="Get the current count of books in the collection",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            )
-        ]
+        return list(self._tools)
+
+    def _new_session_id(self) -> str:
+        """生成新的会话ID"""
+        session_id = secrets.token_hex(16)
+        logger.debug("Creating MCP server with session ID: %s", session_id)
+        return session_id
 
     def create_initialization_options(self) -> Dict[str, Any]:
         """创建初始化选项，包含会话ID"""
-        session_id = str(uuid.uuid4())
-        logger.info(f"Creating MCP server with session ID: {session_id}")
+        return {**_INIT_RESULT_STATIC, "sessionId": self._new_session_id()}
 
-        return {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {
-                "tools": {}
-            },
-            "serverInfo": {
-                "name": "talebook-mcp",
-                "version": "1.0.0"
-            },
-            "sessionId": session_id
-        }
+    def _encode_initialize_result(self) -> bytes:
+        """在预编码的静态部分后拼接新的sessionId"""
+        return _INIT_RESULT_PREFIX_JSON + b',"sessionId":"%s"}' % self._new_session_id().encode()
+
+    def _encode_list_tools_result(self) -> bytes:
+        """返回预编码的工具列表结果"""
+        return _TOOLS_LIST_RESULT_JSON
+
+    async def _handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """处理初始化请求"""
+        return self.create_initialization_options()
+
+    async def _handle_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """处理工具列表请求"""
+        return _TOOLS_LIST_RESULT
+
+    async def _handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """处理工具调用请求"""
+        tool_name = params.get("name")
+        arguments = params.get("arguments", {})
+
+        if tool_name == "get_books_count":
+            text = await self.get_books_count_raw(arguments)
+            return {"content": [{"type": "text", "text": text}]}
+
+        raise JSONRPCError(-32601, f"Unknown tool: {tool_name}")
 
     async def handle_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -101,63 +207,101 @@ class MCPService:
         Returns:
             JSON-RPC响应数据
         """
+        error = _invalid_request_error(request_data)
+        if error is not None:
+            return error
+
+        return await self._dispatch(request_data)
+
+    async def handle_request_json(self, request_data: Any) -> Optional[bytes]:
+        """
+        统一处理MCP请求并返回编码后的响应
+
+        支持JSON-RPC批量请求：数组中的每个请求依次处理，响应按原顺序组成数组；
+        通知（不带id的合法请求）照常处理但不返回响应
+
+        Args:
+            request_data: JSON-RPC请求数据或批量请求数组
+
+        Returns:
+            JSON编码的JSON-RPC响应数据；请求为通知或批量请求全部为通知时返回None
+        """
+        if isinstance(request_data, list):
+            if not request_data:
+                return _EMPTY_BATCH_ERROR_JSON
+
+            responses = []
+            for item in request_data:
+                error = _invalid_request_error(item)
+                if error is not None:
+                    responses.append(orjson.dumps(error))
+                    continue
+                response = await self._encode_response(item)
+                if "id" in item:
+                    responses.append(response)
+
+            if not responses:
+                return None
+            return b"[" + b",".join(responses) + b"]"
+
+        error = _invalid_request_error(request_data)
+        if error is not None:
+            return orjson.dumps(error)
+        response = await self._encode_response(request_data)
+        if "id" not in request_data:
+            return None
+        return response
+
+    async def _encode_response(self, request_data: Dict[str, Any]) -> bytes:
+        """
+        处理已校验的请求并返回编码后的响应
+
+        处理函数带有预编码结果的方法直接拼接JSON，跳过构建和序列化结果
+        """
+        handler = self._method_handlers.get(request_data["method"])
+        encode_result = self._result_encoders.get(handler)
+        if encode_result is not None:
+            return b'{"jsonrpc":"2.0","id":%s,"result":%s}' % (
+                orjson.dumps(request_data.get("id")),
+                encode_result()
+            )
+
+        return orjson.dumps(await self._dispatch(request_data))
+
+    async def _dispatch(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """按方法名分发已校验的请求"""
         method = request_data.get("method")
         request_id = request_data.get("id")
-        params = request_data.get("params", {})
 
-        try:
-            # 处理初始化请求
-            if method == "initialize":
-                init_options = self.create_initialization_options()
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": init_options
-                }
-
-            # 处理工具列表请求（支持新旧两种方法名）
-            elif method == "tools/list":
-                tools = await self.list_tools()
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {"tools": [tool.model_dump(exclude_none=True) for tool in tools]}
-                }
-
-            # 处理工具调用请求（支持新旧两种方法名）
-            elif method == "tools/call":
-                tool_name = params.get("name")
-                arguments = params.get("arguments", {})
-
-                if tool_name == "get_books_count":
-                    result = await self.get_books_count(arguments)
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {"content": [{"type": "text", "text": result[0].text}]}
-                    }
-                else:
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {"code": -32601, "message": f"Unknown tool: {tool_name}"}
-                    }
-
-            # 未知方法
-            else:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {"code": -32601, "message": f"Method not found: {method}"}
-                }
+        handler = self._method_handlers.get(method)
+        if handler is None:
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": -32601, "message": f"Method not found: {method}"}
+            }
 
+        try:
+            result = await handler(request_data.get("params") or {})
+        except JSONRPCError as e:
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": e.code, "message": e.message}
+            }
         except Exception as e:
-            logger.error(f"Error handling MCP request: {e}")
+            logger.error("Error handling MCP request: %s", e)
             return {
                 "jsonrpc": "2.0",
                 "id": request_id,
                 "error": {"code": -32603, "message": f"Internal error: {str(e)}"}
             }
 
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "result": result
+        }
+
 # 创建全局MCP服务实例
 mcp_service = MCPService()
@@ -9,70 +9,165 @@ Talebook MCP Multi-Transport Server
 - HTTP Long Polling
 """
 
-import asyncio
-import json
+import atexit
 import logging
-import uuid
-from typing import Any, Sequence
+import logging.handlers
+import os
+import queue
+from typing import Any, Dict, List, Union
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse, JSONResponse
-from mcp.server import Server
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, JSONResponse
 from mcp.server.sse import SseServerTransport
-from mcp.types import Tool, TextContent, InitializeResult
-import httpx
 
-# Import MCP service
-from mcp_service import mcp_service
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Import MCP service
+from mcp_service import JSONRPCError, mcp_service
+
+# Configure logging: handlers only enqueue records, a listener thread per
+# process does the actual stderr writes
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(
+    level=logging.INFO,
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+    force=True
+)
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves streaming transport endpoints uncompressed."""
+
+    def __init__(self, app, excluded_paths: tuple[str, ...] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 # FastAPI app
 app = FastAPI(
     title="Talebook MCP Multi-Transport Server",
     description="MCP server supporting multiple streaming HTTP transports",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Compress large JSON replies for clients that accept gzip; SSE framing and
+# /true-stream chunks must reach the client unbuffered
+app.add_middleware(
+    StreamingAwareGZipMiddleware,
+    minimum_size=1024,
+    excluded_paths=("/sse", "/true-stream")
+)
+
+class ParseError(JSONRPCError):
+    """JSON-RPC parse error carrying its pre-encoded response envelope."""
+
+    def __init__(self, message: str, body: bytes):
+        super().__init__(-32700, message)
+        self.body = body
+
+def _encode_parse_error(message: str) -> bytes:
+    """Encode the JSON-RPC envelope for a parse error."""
+    return orjson.dumps({
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {"code": -32700, "message": message}
+    })
+
+# Parse errors never carry a request id, so their envelopes are encoded once
+_NO_BODY_MESSAGE = "Parse error: No request body"
+_NO_BODY_RESPONSE = _encode_parse_error(_NO_BODY_MESSAGE)
+_INVALID_JSON_MESSAGE = "Parse error: Invalid JSON"
+_INVALID_JSON_RESPONSE = _encode_parse_error(_INVALID_JSON_MESSAGE)
+
+async def read_jsonrpc(request: Request) -> Union[Dict[str, Any], List[Any]]:
+    """Read the request body and parse it as a JSON-RPC message or batch."""
+    raw = await request.body()
+    if not raw:
+        raise ParseError(_NO_BODY_MESSAGE, _NO_BODY_RESPONSE)
+
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        raise ParseError(_INVALID_JSON_MESSAGE, _INVALID_JSON_RESPONSE)
+
+def parse_error_response(e: ParseError) -> Response:
+    """Return the pre-encoded JSON-RPC envelope for a parse error."""
+    return Response(
+        content=e.body,
+        status_code=400,
+        media_type="application/json"
+    )
+
+# Metadata endpoints return constant bodies, so they are encoded once
+_ROOT_BODY = orjson.dumps({
+    "message": "Talebook MCP Multi-Transport Server",
+    "status": "running",
+    "transports": {
+        "sse": "/sse",
+        "websocket": "/ws",
+        "http_stream": "/stream",
+        "long_polling": "/poll"
+    },
+    "tools": ["get_books_count"]
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with transport information."""
-    return {
-        "message": "Talebook MCP Multi-Transport Server",
-        "status": "running",
-        "transports": {
-            "sse": "/sse",
-            "websocket": "/ws",
-            "http_stream": "/stream",
-            "long_polling": "/poll"
-        },
-        "tools": ["get_books_count"]
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "server": "talebook-mcp"})
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "server": "talebook-mcp"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 # 1. Server-Sent Events (SSE) Transport
+# One transport and one set of SDK initialization options serve every SSE
+# connection; the transport keeps its own per-session state
+sse_transport = SseServerTransport("/messages/")
+sse_init_options = mcp_service.server.create_initialization_options()
+
+# Client messages for an open SSE session are posted to the endpoint the
+# stream announces, /messages/?session_id=...
+app.mount("/messages/", app=sse_transport.handle_post_message)
+
 @app.post("/sse")
 async def handle_sse(request: Request):
     """Handle MCP over Server-Sent Events."""
     logger.info("New SSE connection from MCP client")
     try:
-        transport = SseServerTransport("/sse")
-        async with transport.connect_sse(request) as streams:
+        async with sse_transport.connect_sse(request.scope, request.receive, request._send) as streams:
             logger.info("MCP server connected via SSE transport")
             await mcp_service.server.run(
                 streams[0],
                 streams[1],
-                mcp_service.create_initialization_options()
+                sse_init_options
             )
     except Exception as e:
-        logger.error(f"Error in SSE handler: {e}")
+        logger.error("Error in SSE handler: %s", e)
         raise
 
 # 2. WebSocket Transport
@@ -82,186 +177,130 @@ async def websocket_endpoint(websocket: WebSocket):
     logger.info("New WebSocket connection from MCP client")
     await websocket.accept()
 
+    # Bind the per-message callables once for the lifetime of the connection
+    receive = websocket.receive
+    send_bytes = websocket.send_bytes
+    send_text = websocket.send_text
+    loads = orjson.loads
+    handle_request_json = mcp_service.handle_request_json
+
     try:
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            request_data = json.loads(data)
-            logger.info(f"WebSocket request: {request_data}")
+            # Receive message from client; binary frames are parsed as-is,
+            # text frames are still accepted for clients that send them
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            data = message.get("bytes")
+            is_text = data is None
+            request_data = loads(message["text"] if is_text else data)
+            logger.debug("WebSocket request: %s", request_data)
 
             # Process MCP request using unified service
-            response = await mcp_service.handle_request(request_data)
+            response = await handle_request_json(request_data)
 
-            # Send response back to client
-            await websocket.send_text(json.dumps(response))
+            # Send response back to client in the frame type it used;
+            # notifications get no reply
+            if response is None:
+                continue
+            if is_text:
+                await send_text(response.decode())
+            else:
+                await send_bytes(response)
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
     except Exception as e:
-        logger.error(f"Error in WebSocket handler: {e}")
+        logger.error("Error in WebSocket handler: %s", e)
         await websocket.close()
 
-# 3. Simple HTTP Transport (No Streaming)
-@app.post("/simple")
-async def handle_simple_http(request: Request):
-    """Handle MCP over simple HTTP (no streaming)."""
-    logger.info("New simple HTTP request from MCP client")
+# 3-5. Request/response HTTP transports
+async def handle_jsonrpc_http(request: Request):
+    """
+    Handle one MCP JSON-RPC request over plain HTTP.
 
-    try:
-        body = await request.body()
-        if not body:
-            return JSONResponse({"error": "No request body"}, status_code=400)
+    Serves the simple HTTP, HTTP stream and long polling endpoints, which
+    differ only in name. Long polling answers every request as soon as it
+    is processed; no per-session queue is kept, so any worker process can
+    serve any poll.
+    """
+    logger.debug("New HTTP request on %s from MCP client", request.url.path)
 
-        request_data = json.loads(body)
-        logger.info(f"Simple HTTP request: {request_data}")
+    try:
+        request_data = await read_jsonrpc(request)
+        logger.debug("HTTP request on %s: %s", request.url.path, request_data)
 
         # Process MCP request using unified service
-        response = await mcp_service.handle_request(request_data)
-        return JSONResponse(response)
-
+        response = await mcp_service.handle_request_json(request_data)
+        if response is None:
+            # Notifications get no JSON-RPC response
+            return Response(status_code=204)
+        return Response(content=response, media_type="application/json")
+
+    except ParseError as e:
+        return parse_error_response(e)
     except Exception as e:
-        logger.error(f"Error in simple HTTP handler: {e}")
-        return JSONResponse({
+        logger.error("Error in HTTP handler for %s: %s", request.url.path, e)
+        return ORJSONResponse({
             "jsonrpc": "2.0",
             "error": {"code": -32603, "message": str(e)}
         }, status_code=500)
 
+# 3. Simple HTTP Transport (No Streaming)
 # 4. HTTP Chunked Streaming Transport
-@app.post("/stream")
-async def handle_http_stream(request: Request):
-    """Handle MCP over HTTP streaming."""
-    logger.info("New HTTP stream connection from MCP client")
-
-    try:
-        # Read request body
-        body = await request.body()
-        if not body:
-            return JSONResponse({"error": "No request body"}, status_code=400)
-
-        request_data = json.loads(body)
-        logger.info(f"HTTP stream request: {request_data}")
-
-        # Process MCP request using unified service
-        response = await mcp_service.handle_request(request_data)
-
-        # Return direct JSON response instead of streaming
-        return JSONResponse(response)
-
-    except Exception as e:
-        logger.error(f"Error in HTTP stream handler: {e}")
-        return JSONResponse({
-            "jsonrpc": "2.0",
-            "error": {"code": -32603, "message": str(e)}
-        }, status_code=500)
+# 5. HTTP Long Polling Transport
+for path in ("/simple", "/stream", "/poll"):
+    app.add_api_route(path, handle_jsonrpc_http, methods=["POST"])
 
 # 4.5. True HTTP Streaming Transport
 @app.post("/true-stream")
 async def handle_true_http_stream(request: Request):
     """Handle MCP over HTTP with proper streaming."""
-    logger.info("New true HTTP stream connection from MCP client")
-
-    async def generate_response():
-        try:
-            # Read request body
-            body = await request.body()
-            if not body:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32700, "message": "Parse error: No request body"}
-                }
-                yield json.dumps(error_response).encode()
-                return
-
-            request_data = json.loads(body)
-            logger.info(f"True stream request: {request_data}")
-
-            # Process MCP request using unified service
-            response = await mcp_service.handle_request(request_data)
-
-            # Send the response as a single chunk and close
-            yield json.dumps(response).encode()
-
-        except Exception as e:
-            logger.error(f"Error in true stream handler: {e}")
-            error_response = {
-                "jsonrpc": "2.0",
-                "error": {"code": -32603, "message": str(e)}
-            }
-            yield json.dumps(error_response).encode()
-
-    return StreamingResponse(
-        generate_response(),
-        media_type="application/json",
-        headers={
-            "Connection": "close",  # 确保连接关闭
-            "Cache-Control": "no-cache"
+    # The response is always a single message, so send it in one body
+    # and keep the connection alive for the client's next request
+    response = await handle_jsonrpc_http(request)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+_TRANSPORTS_BODY = orjson.dumps({
+    "available_transports": [
+        {
+            "name": "sse",
+            "endpoint": "/sse",
+            "method": "POST",
+            "description": "Server-Sent Events streaming"
+        },
+        {
+            "name": "websocket",
+            "endpoint": "/ws",
+            "method": "WebSocket",
+            "description": "WebSocket bidirectional streaming"
+        },
+        {
+            "name": "simple-http",
+            "endpoint": "/simple",
+            "method": "POST",
+            "description": "Simple HTTP (no streaming)"
+        },
+        {
+            "name": "http-stream",
+            "endpoint": "/stream",
+            "method": "POST",
+            "description": "HTTP JSON streaming"
+        },
+        {
+            "name": "long-polling",
+            "endpoint": "/poll",
+            "method": "POST",
+            "description": "HTTP long polling"
         }
-    )
-
-# 5. HTTP Long Polling Transport
-polling_queues = {}
-
-@app.post("/poll")
-async def handle_long_polling(request: Request):
-    """Handle MCP over HTTP long polling."""
-    logger.info("New HTTP long polling connection from MCP client")
-
-    try:
-        body = await request.body()
-        if not body:
-            return JSONResponse({"error": "No request body"}, status_code=400)
-
-        request_data = json.loads(body)
-        logger.info(f"Long polling request: {request_data}")
-
-        # Process MCP request using unified service
-        response = await mcp_service.handle_request(request_data)
-        return JSONResponse(response)
-
-    except Exception as e:
-        logger.error(f"Error in long polling handler: {e}")
-        return JSONResponse({
-            "jsonrpc": "2.0",
-            "error": {"code": -32603, "message": str(e)}
-        }, status_code=500)
+    ]
+})
 
 @app.get("/transports")
 async def get_transports():
     """Get available transport methods."""
-    return {
-        "available_transports": [
-            {
-                "name": "sse",
-                "endpoint": "/sse",
-                "method": "POST",
-                "description": "Server-Sent Events streaming"
-            },
-            {
-                "name": "websocket",
-                "endpoint": "/ws",
-                "method": "WebSocket",
-                "description": "WebSocket bidirectional streaming"
-            },
-            {
-                "name": "simple-http",
-                "endpoint": "/simple",
-                "method": "POST",
-                "description": "Simple HTTP (no streaming)"
-            },
-            {
-                "name": "http-stream",
-                "endpoint": "/stream",
-                "method": "POST",
-                "description": "HTTP JSON streaming"
-            },
-            {
-                "name": "long-polling",
-                "endpoint": "/poll",
-                "method": "POST",
-                "description": "HTTP long polling"
-            }
-        ]
-    }
+    return Response(content=_TRANSPORTS_BODY, media_type="application/json")
 
 def main():
     """Main function to run the multi-transport HTTP MCP server."""
@@ -272,11 +311,20 @@ def main():
     logger.info("🔄 Long Polling: http://localhost:3001/poll")
     logger.info("ℹ️  Transports info: http://localhost:3001/transports")
 
+    # SSE sessions live in the memory of the process that opened them, so a
+    # single worker is the default; MCP_WORKERS opts into more processes for
+    # deployments that do not use /sse. Only multiple workers need the import
+    # string, a single one serves this module's app without re-importing it
+    workers = int(os.environ.get("MCP_WORKERS", "1"))
     uvicorn.run(
-        app,
+        "multi_transport_server:app" if workers > 1 else app,
         host="0.0.0.0",
         port=3001,
-        log_level="info"
+        loop="uvloop" if uvloop else "asyncio",
+        http="httptools",
+        workers=workers,
+        log_level="warning",
+        access_log=False
     )
 
 if __name__ == "__main__":
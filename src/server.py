@@ -7,7 +7,6 @@ A simple MCP server that provides book-related tools using FastAPI.
 
 import asyncio
 import logging
-import uuid
 from typing import Any, Sequence
 
 import uvicorn
@@ -17,46 +16,45 @@ from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, InitializeResult
 from pydantic import BaseModel
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize MCP Server
-server = Server("talebook-mcp")
-
-# Set initialization options with session ID
-def create_initialization_options():
-    """Create initialization options with session ID."""
-    session_id = str(uuid.uuid4())
-    logger.info(f"Creating MCP server with session ID: {session_id}")
-
-    return {
-        "protocolVersion": "2024-11-05",
-        "capabilities": {
-            "tools": {}
-        },
-        "serverInfo": {
-            "name": "talebook-mcp",
-            "version": "1.0.0"
-        },
-        "sessionId": session_id
+server = Server("talebook-mcp", version="1.0.0")
+
+# Static tool schemas as plain dicts, built once at import time
+_TOOLS_RAW = [
+    {
+        "name": "get_books_count",
+        "description": "Get the current count of books in the collection",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
     }
+]
+
+# Tool models are validated once and shared by every list_tools call
+_TOOLS = tuple(Tool(**tool) for tool in _TOOLS_RAW)
+
+# Name/description summaries served by the HTTP endpoints
+_TOOL_SUMMARIES = [
+    {"name": tool["name"], "description": tool["description"]}
+    for tool in _TOOLS_RAW
+]
 
 # Tool definitions
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
-    return [
-        Tool(
-            name="get_books_count",
-            description="Get the current count of books in the collection",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        )
-    ]
+    return list(_TOOLS)
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any] | None = None) -> Sequence[TextContent]:
@@ -77,7 +75,7 @@ async def get_books_count(arguments: dict[str, Any]) -> Sequence[TextContent]:
         books_count = 1
 
         result = f"Current books count: {books_count}"
-        logger.info(f"Books count requested, returning: {books_count}")
+        logger.debug("Books count requested, returning: %s", books_count)
 
         return [TextContent(type="text", text=result)]
 
@@ -101,8 +99,7 @@ async def root():
 @app.get("/tools")
 async def get_tools():
     """Get available tools via HTTP."""
-    tools = await list_tools()
-    return {"tools": [{"name": tool.name, "description": tool.description} for tool in tools]}
+    return {"tools": _TOOL_SUMMARIES}
 
 @app.post("/tools/get_books_count")
 async def http_get_books_count():
@@ -110,6 +107,9 @@ async def http_get_books_count():
     result = await get_books_count({})
     return {"result": result[0].text if result else "No result"}
 
+# SDK initialization options, built once after the handlers are registered
+init_options = server.create_initialization_options()
+
 async def main():
     """Main function to run the MCP server."""
     # Run the MCP server with stdio transport
@@ -117,12 +117,12 @@ async def main():
         await server.run(
             read_stream,
             write_stream,
-            create_initialization_options()
+            init_options
         )
 
 def run_fastapi():
     """Run the FastAPI server."""
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop" if uvloop else "asyncio")
 
 if __name__ == "__main__":
     import sys
@@ -134,4 +134,7 @@ if __name__ == "__main__":
     else:
         # Run MCP server with stdio
         logger.info("Starting MCP server with stdio transport")
-        asyncio.run(main())
+        if uvloop:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
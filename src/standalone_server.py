@@ -8,56 +8,55 @@ Run this server separately and connect via HTTP from MCP clients.
 
 import asyncio
 import logging
-import uuid
 from typing import Any, Sequence
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
 from mcp.types import Tool, TextContent, InitializeResult
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize MCP Server
-server = Server("talebook-mcp")
-
-# Set initialization options with session ID
-def create_initialization_options():
-    """Create initialization options with session ID."""
-    session_id = str(uuid.uuid4())
-    logger.info(f"Creating MCP server with session ID: {session_id}")
-
-    return {
-        "protocolVersion": "2024-11-05",
-        "capabilities": {
-            "tools": {}
-        },
-        "serverInfo": {
-            "name": "talebook-mcp",
-            "version": "1.0.0"
-        },
-        "sessionId": session_id
+server = Server("talebook-mcp", version="1.0.0")
+
+# Static tool schemas as plain dicts, built once at import time
+_TOOLS_RAW = [
+    {
+        "name": "get_books_count",
+        "description": "Get the current count of books in the collection",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
     }
+]
+
+# Tool models are validated once and shared by every list_tools call
+_TOOLS = tuple(Tool(**tool) for tool in _TOOLS_RAW)
+
+# Name/description summaries served by the HTTP endpoints
+_TOOL_SUMMARIES = [
+    {"name": tool["name"], "description": tool["description"]}
+    for tool in _TOOLS_RAW
+]
 
 # Tool definitions
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
-    return [
-        Tool(
-            name="get_books_count",
-            description="Get the current count of books in the collection",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        )
-    ]
+    return list(_TOOLS)
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any] | None = None) -> Sequence[TextContent]:
@@ -75,7 +74,7 @@ async def get_books_count(arguments: dict[str, Any]) -> Sequence[TextContent]:
     try:
         books_count = 1
         result = f"Current books count: {books_count}"
-        logger.info(f"Books count requested, returning: {books_count}")
+        logger.debug("Books count requested, returning: %s", books_count)
         return [TextContent(type="text", text=result)]
 
     except Exception as e:
@@ -90,24 +89,38 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Metadata endpoints return constant bodies, so they are encoded once
+_ROOT_BODY = orjson.dumps({
+    "message": "Talebook MCP HTTP Server",
+    "status": "running",
+    "transport": "sse",
+    "endpoints": {
+        "sse": "/sse",
+        "health": "/"
+    },
+    "tools": ["get_books_count"]
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with server info."""
-    return {
-        "message": "Talebook MCP HTTP Server",
-        "status": "running",
-        "transport": "sse",
-        "endpoints": {
-            "sse": "/sse",
-            "health": "/"
-        },
-        "tools": ["get_books_count"]
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "server": "talebook-mcp"})
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "server": "talebook-mcp"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+# One transport and one set of initialization options serve every SSE
+# connection; the transport keeps its own per-session state
+sse_transport = SseServerTransport("/messages/")
+sse_init_options = server.create_initialization_options()
+
+# Client messages for an open SSE session are posted to the endpoint the
+# stream announces, /messages/?session_id=...
+app.mount("/messages/", app=sse_transport.handle_post_message)
 
 @app.post("/sse")
 async def handle_sse(request: Request):
@@ -115,35 +128,28 @@ async def handle_sse(request: Request):
     logger.info("New SSE connection from MCP client")
 
     try:
-        transport = SseServerTransport("/sse")
-
-        async with transport.connect_sse(request) as streams:
+        async with sse_transport.connect_sse(request.scope, request.receive, request._send) as streams:
             logger.info("MCP server connected via SSE transport")
             await server.run(
                 streams[0],
                 streams[1],
-                create_initialization_options()
+                sse_init_options
             )
 
     except Exception as e:
-        logger.error(f"Error in SSE handler: {e}")
+        logger.error("Error in SSE handler: %s", e)
         raise
 
+_INFO_BODY = orjson.dumps({
+    "server_name": "talebook-mcp",
+    "transport": "sse",
+    "available_tools": _TOOL_SUMMARIES
+})
+
 @app.get("/info")
 async def server_info():
     """Get server information."""
-    tools = await list_tools()
-    return {
-        "server_name": "talebook-mcp",
-        "transport": "sse",
-        "available_tools": [
-            {
-                "name": tool.name,
-                "description": tool.description
-            }
-            for tool in tools
-        ]
-    }
+    return Response(content=_INFO_BODY, media_type="application/json")
 
 def main():
     """Main function to run the standalone HTTP MCP server."""
@@ -156,7 +162,10 @@ def main():
         app,
         host="0.0.0.0",
         port=3001,
-        log_level="info"
+        loop="uvloop" if uvloop else "asyncio",
+        http="httptools",
+        log_level="warning",
+        access_log=False
     )
 
 if __name__ == "__main__":
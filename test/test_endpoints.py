@@ -7,8 +7,9 @@ import asyncio
 import json
 import time
 import httpx
+import orjson
 
-async def test_endpoint(url, method_name, description):
+async def test_endpoint(client, url, method_name, description):
     """测试特定端点"""
     print(f"\n🧪 测试 {description}")
     print(f"   端点: {url}")
@@ -25,15 +26,14 @@ async def test_endpoint(url, method_name, description):
     try:
         start_time = time.time()
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                url,
-                json=request_data,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
-            )
+        response = await client.post(
+            url,
+            json=request_data,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json"
+            }
+        )
 
         end_time = time.time()
         duration = end_time - start_time
@@ -43,7 +43,7 @@ async def test_endpoint(url, method_name, description):
         print(f"   响应头: {dict(response.headers)}")
 
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print(f"   响应内容: {json.dumps(result, indent=2, ensure_ascii=False)}")
             print("   ✅ 成功")
         else:
@@ -61,36 +61,38 @@ async def main():
 
     base_url = "http://localhost:3001"
 
-    # 检查服务器是否运行
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            health_response = await client.get(f"{base_url}/health")
+    # 所有请求复用同一个客户端的连接池
+    limits = httpx.Limits(max_keepalive_connections=20)
+    async with httpx.AsyncClient(timeout=10.0, limits=limits) as client:
+        # 检查服务器是否运行
+        try:
+            health_response = await client.get(f"{base_url}/health", timeout=5.0)
+
+            if health_response.status_code != 200:
+                print("❌ 服务器未运行，请先启动: python multi_transport_server.py")
+                return
+
+            print("✅ 服务器运行中")
 
-        if health_response.status_code != 200:
-            print("❌ 服务器未运行，请先启动: python multi_transport_server.py")
+        except Exception as e:
+            print(f"❌ 无法连接到服务器: {e}")
+            print("请先启动服务器: python multi_transport_server.py")
             return
 
-        print("✅ 服务器运行中")
+        # 测试不同端点
+        endpoints = [
+            ("/simple", "Simple HTTP"),
+            ("/stream", "HTTP Stream (Fixed)"),
+            ("/true-stream", "True HTTP Stream"),
+            ("/poll", "Long Polling")
+        ]
 
-    except Exception as e:
-        print(f"❌ 无法连接到服务器: {e}")
-        print("请先启动服务器: python multi_transport_server.py")
-        return
-
-    # 测试不同端点
-    endpoints = [
-        ("/simple", "Simple HTTP"),
-        ("/stream", "HTTP Stream (Fixed)"),
-        ("/true-stream", "True HTTP Stream"),
-        ("/poll", "Long Polling")
-    ]
-
-    for endpoint, description in endpoints:
-        # 测试工具列表
-        await test_endpoint(f"{base_url}{endpoint}", "tools/list", f"{description} - 列出工具")
-
-        # 测试工具调用
-        await test_endpoint(f"{base_url}{endpoint}", "tools/call", f"{description} - 调用工具")
+        for endpoint, description in endpoints:
+            # 测试工具列表
+            await test_endpoint(client, f"{base_url}{endpoint}", "tools/list", f"{description} - 列出工具")
+
+            # 测试工具调用
+            await test_endpoint(client, f"{base_url}{endpoint}", "tools/call", f"{description} - 调用工具")
 
     print("\n🏁 测试完成")
 
@@ -9,6 +9,7 @@ import asyncio
 import json
 import logging
 import httpx
+import orjson
 import websockets
 
 # Configure logging
@@ -17,26 +18,25 @@ logger = logging.getLogger(__name__)
 
 BASE_URL = "http://localhost:3001"
 
-async def test_initialize_simple_http():
+async def test_initialize_simple_http(client):
     """测试简单HTTP端点的initialize方法"""
     logger.info("Testing initialize method on Simple HTTP endpoint...")
 
-    async with httpx.AsyncClient() as client:
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {}
-        }
-
-        response = await client.post(f"{BASE_URL}/simple", json=init_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"Initialize response: {data}")
-        assert "result" in data
-        assert "sessionId" in data["result"]
-        assert "protocolVersion" in data["result"]
-        assert data["result"]["protocolVersion"] == "2024-11-05"
+    init_request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {}
+    }
+
+    response = await client.post(f"{BASE_URL}/simple", json=init_request)
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    logger.info(f"Initialize response: {data}")
+    assert "result" in data
+    assert "sessionId" in data["result"]
+    assert "protocolVersion" in data["result"]
+    assert data["result"]["protocolVersion"] == "2024-11-05"
 
     logger.info("✅ Simple HTTP initialize test passed")
 
@@ -55,7 +55,7 @@ async def test_initialize_websocket():
 
         await websocket.send(json.dumps(init_request))
         response = await websocket.recv()
-        data = json.loads(response)
+        data = orjson.loads(response)
         logger.info(f"Initialize response: {data}")
         assert "result" in data
         assert "sessionId" in data["result"]
@@ -64,89 +64,86 @@ async def test_initialize_websocket():
 
     logger.info("✅ WebSocket initialize test passed")
 
-async def test_initialize_http_stream():
+async def test_initialize_http_stream(client):
     """测试HTTP Stream端点的initialize方法"""
     logger.info("Testing initialize method on HTTP Stream endpoint...")
 
-    async with httpx.AsyncClient() as client:
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {}
-        }
-
-        response = await client.post(f"{BASE_URL}/stream", json=init_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"Initialize response: {data}")
-        assert "result" in data
-        assert "sessionId" in data["result"]
-        assert "protocolVersion" in data["result"]
-        assert data["result"]["protocolVersion"] == "2024-11-05"
+    init_request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {}
+    }
+
+    response = await client.post(f"{BASE_URL}/stream", json=init_request)
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    logger.info(f"Initialize response: {data}")
+    assert "result" in data
+    assert "sessionId" in data["result"]
+    assert "protocolVersion" in data["result"]
+    assert data["result"]["protocolVersion"] == "2024-11-05"
 
     logger.info("✅ HTTP Stream initialize test passed")
 
-async def test_initialize_long_polling():
+async def test_initialize_long_polling(client):
     """测试Long Polling端点的initialize方法"""
     logger.info("Testing initialize method on Long Polling endpoint...")
 
-    async with httpx.AsyncClient() as client:
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {}
-        }
-
-        response = await client.post(f"{BASE_URL}/poll", json=init_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"Initialize response: {data}")
-        assert "result" in data
-        assert "sessionId" in data["result"]
-        assert "protocolVersion" in data["result"]
-        assert data["result"]["protocolVersion"] == "2024-11-05"
+    init_request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {}
+    }
+
+    response = await client.post(f"{BASE_URL}/poll", json=init_request)
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    logger.info(f"Initialize response: {data}")
+    assert "result" in data
+    assert "sessionId" in data["result"]
+    assert "protocolVersion" in data["result"]
+    assert data["result"]["protocolVersion"] == "2024-11-05"
 
     logger.info("✅ Long Polling initialize test passed")
 
-async def test_mcp_standard_methods():
+async def test_mcp_standard_methods(client):
     """测试MCP标准方法名支持"""
     logger.info("Testing MCP standard method names...")
 
-    async with httpx.AsyncClient() as client:
-        # 测试 mcp:list-tools
-        list_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "mcp:list-tools",
-            "params": {}
+    # 测试 mcp:list-tools
+    list_request = {
+        "jsonrpc": "2.0",
+        "id": 2,
+        "method": "mcp:list-tools",
+        "params": {}
+    }
+
+    response = await client.post(f"{BASE_URL}/simple", json=list_request)
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    logger.info(f"mcp:list-tools response: {data}")
+    assert "result" in data
+    assert "tools" in data["result"]
+
+    # 测试 mcp:call-tool
+    call_request = {
+        "jsonrpc": "2.0",
+        "id": 3,
+        "method": "mcp:call-tool",
+        "params": {
+            "name": "get_books_count",
+            "arguments": {}
         }
+    }
 
-        response = await client.post(f"{BASE_URL}/simple", json=list_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:list-tools response: {data}")
-        assert "result" in data
-        assert "tools" in data["result"]
-
-        # 测试 mcp:call-tool
-        call_request = {
-            "jsonrpc": "2.0",
-            "id": 3,
-            "method": "mcp:call-tool",
-            "params": {
-                "name": "get_books_count",
-                "arguments": {}
-            }
-        }
-
-        response = await client.post(f"{BASE_URL}/simple", json=call_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:call-tool response: {data}")
-        assert "result" in data
-        assert "content" in data["result"]
+    response = await client.post(f"{BASE_URL}/simple", json=call_request)
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    logger.info(f"mcp:call-tool response: {data}")
+    assert "result" in data
+    assert "content" in data["result"]
 
     logger.info("✅ MCP standard methods test passed")
 
@@ -155,11 +152,16 @@ async def main():
     logger.info("🚀 Starting initialize method tests...")
 
     try:
-        await test_initialize_simple_http()
-        await test_initialize_websocket()
-        await test_initialize_http_stream()
-        await test_initialize_long_polling()
-        await test_mcp_standard_methods()
+        # 共享一个客户端的连接池，并发执行各端点测试
+        limits = httpx.Limits(max_keepalive_connections=20)
+        async with httpx.AsyncClient(timeout=10.0, limits=limits) as client:
+            await asyncio.gather(
+                test_initialize_simple_http(client),
+                test_initialize_websocket(),
+                test_initialize_http_stream(client),
+                test_initialize_long_polling(client),
+                test_mcp_standard_methods(client)
+            )
 
         logger.info("🎉 All tests passed! Initialize method and MCP standard methods are supported on all endpoints.")
 
@@ -4,8 +4,8 @@
 """
 
 import asyncio
-import json
 import httpx
+import orjson
 
 async def test_mcp_initialization():
     """测试完整的MCP初始化流程"""
@@ -33,7 +33,7 @@ async def test_mcp_initialization():
 
         response = await client.post(f"{base_url}/simple", json=init_request)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             session_id = result.get("result", {}).get("sessionId")
             print(f"   ✅ 初始化成功")
             print(f"   📋 Session ID: {session_id}")
@@ -53,7 +53,7 @@ async def test_mcp_initialization():
 
         response = await client.post(f"{base_url}/simple", json=tools_request)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             tools = result.get("result", {}).get("tools", [])
             print(f"   ✅ 获取工具列表成功")
             for tool in tools:
@@ -74,7 +74,7 @@ async def test_mcp_initialization():
 
         response = await client.post(f"{base_url}/simple", json=call_request)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             content = result.get("result", {}).get("content", [])
             print(f"   ✅ 工具调用成功")
             for item in content:
@@ -87,7 +87,7 @@ async def test_mcp_initialization():
         for i in range(3):
             response = await client.post(f"{base_url}/simple", json=init_request)
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 session_id = result.get("result", {}).get("sessionId")
                 print(f"   🆔 Session ID #{i+1}: {session_id}")
             else:
@@ -8,194 +8,176 @@ Test script to verify that all endpoints support both legacy and MCP-standard me
 """
 
 import asyncio
-import json
+import gc
 import logging
+import os
+import time
+import fastjsonschema
 import httpx
+import orjson
 import websockets
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+# Configure logging; set LOG_LEVEL=DEBUG to trace every test and response.
+# httpx logs each request at INFO, which would flood throughput runs
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
+# The throughput summary is the result of the run, so its logger keeps INFO
+# enabled whatever LOG_LEVEL is
+result_logger = logging.getLogger(f"{__name__}.result")
+result_logger.setLevel(logging.INFO)
 
 BASE_URL = "http://localhost:3001"
-
-async def test_simple_http():
-    """Test simple HTTP endpoint with MCP-standard methods."""
-    logger.info("Testing Simple HTTP endpoint with MCP-standard methods...")
-
-    async with httpx.AsyncClient() as client:
-        # Test mcp:list-tools
-        list_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "mcp:list-tools",
-            "params": {}
-        }
-
-        response = await client.post(f"{BASE_URL}/simple", json=list_request)
+WS_URL = "ws://localhost:3001/ws"
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Number of concurrent rounds over all endpoints; raise it to measure throughput
+BENCH_ROUNDS = int(os.environ.get("MCP_BENCH_N", "1"))
+WS_MAX_SIZE = 16 * 1024 * 1024
+WS_WRITE_LIMIT = 4 * 1024 * 1024
+
+# The request payloads never change, so they are encoded once
+LIST_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "mcp:list-tools",
+    "params": {}
+}
+CALL_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "mcp:call-tool",
+    "params": {
+        "name": "get_books_count",
+        "arguments": {}
+    }
+}
+LIST_REQUEST_BYTES = orjson.dumps(LIST_REQUEST)
+LIST_REQUEST_STR = LIST_REQUEST_BYTES.decode()
+BATCH_REQUEST_BYTES = orjson.dumps([LIST_REQUEST, CALL_REQUEST])
+BATCH_REQUEST_STR = BATCH_REQUEST_BYTES.decode()
+
+# (path, name) of the request/response HTTP endpoints under test
+HTTP_ENDPOINTS = (
+    ("/simple", "Simple HTTP"),
+    ("/stream", "HTTP Stream"),
+    ("/poll", "Long Polling"),
+)
+
+async def warmup(client: httpx.AsyncClient, websocket):
+    """Send one mcp:list-tools to every endpoint before the timed run."""
+    for path, _ in HTTP_ENDPOINTS:
+        response = await client.post(f"{BASE_URL}{path}", content=LIST_REQUEST_BYTES, headers=JSON_HEADERS)
         assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:list-tools response: {data}")
-        assert "result" in data
-        assert "tools" in data["result"]
-        assert len(data["result"]["tools"]) > 0
-
-        # Test mcp:call-tool
-        call_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "mcp:call-tool",
-            "params": {
-                "name": "get_books_count",
-                "arguments": {}
+    await websocket.send(LIST_REQUEST_STR)
+    await websocket.recv()
+
+# Expected shape of the batch response, compiled once into a validator
+validate_batch_response = fastjsonschema.compile({
+    "type": "array",
+    "minItems": 2,
+    "maxItems": 2,
+    "items": [
+        {
+            "type": "object",
+            "required": ["result"],
+            "properties": {
+                "result": {
+                    "type": "object",
+                    "required": ["tools"],
+                    "properties": {"tools": {"type": "array", "minItems": 1}}
+                }
             }
-        }
-
-        response = await client.post(f"{BASE_URL}/simple", json=call_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:call-tool response: {data}")
-        assert "result" in data
-        assert "content" in data["result"]
-
-    logger.info("✅ Simple HTTP endpoint MCP-standard methods test passed")
-
-async def test_websocket():
-    """Test WebSocket endpoint with MCP-standard methods."""
-    logger.info("Testing WebSocket endpoint with MCP-standard methods...")
-
-    uri = "ws://localhost:3001/ws"
-    async with websockets.connect(uri) as websocket:
-        # Test mcp:list-tools
-        list_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "mcp:list-tools",
-            "params": {}
-        }
-
-        await websocket.send(json.dumps(list_request))
-        response = await websocket.recv()
-        data = json.loads(response)
-        logger.info(f"mcp:list-tools response: {data}")
-        assert "result" in data
-        assert "tools" in data["result"]
-
-        # Test mcp:call-tool
-        call_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "mcp:call-tool",
-            "params": {
-                "name": "get_books_count",
-                "arguments": {}
+        },
+        {
+            "type": "object",
+            "required": ["result"],
+            "properties": {
+                "result": {"type": "object", "required": ["content"]}
             }
         }
+    ]
+})
 
-        await websocket.send(json.dumps(call_request))
-        response = await websocket.recv()
-        data = json.loads(response)
-        logger.info(f"mcp:call-tool response: {data}")
-        assert "result" in data
-        assert "content" in data["result"]
-
-    logger.info("✅ WebSocket endpoint MCP-standard methods test passed")
-
-async def test_http_stream():
-    """Test HTTP Stream endpoint with MCP-standard methods."""
-    logger.info("Testing HTTP Stream endpoint with MCP-standard methods...")
-
-    async with httpx.AsyncClient() as client:
-        # Test mcp:list-tools
-        list_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "mcp:list-tools",
-            "params": {}
-        }
+def check_batch_response(data):
+    """Check the responses to the mcp:list-tools and mcp:call-tool batch."""
+    logger.debug("batch response: %s", data)
+    validate_batch_response(data)
 
-        response = await client.post(f"{BASE_URL}/stream", json=list_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:list-tools response: {data}")
-        assert "result" in data
-        assert "tools" in data["result"]
-
-        # Test mcp:call-tool
-        call_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "mcp:call-tool",
-            "params": {
-                "name": "get_books_count",
-                "arguments": {}
-            }
-        }
+async def test_http_endpoint(client: httpx.AsyncClient, path: str, name: str):
+    """Test one HTTP endpoint with MCP-standard methods."""
+    logger.debug("Testing %s endpoint with MCP-standard methods...", name)
 
-        response = await client.post(f"{BASE_URL}/stream", json=call_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:call-tool response: {data}")
-        assert "result" in data
-        assert "content" in data["result"]
-
-    logger.info("✅ HTTP Stream endpoint MCP-standard methods test passed")
-
-async def test_long_polling():
-    """Test Long Polling endpoint with MCP-standard methods."""
-    logger.info("Testing Long Polling endpoint with MCP-standard methods...")
-
-    async with httpx.AsyncClient() as client:
-        # Test mcp:list-tools
-        list_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "mcp:list-tools",
-            "params": {}
-        }
+    # Send mcp:list-tools and mcp:call-tool as one JSON-RPC batch
+    response = await client.post(f"{BASE_URL}{path}", content=BATCH_REQUEST_BYTES, headers=JSON_HEADERS)
+    assert response.status_code == 200
+    check_batch_response(orjson.loads(response.content))
 
-        response = await client.post(f"{BASE_URL}/poll", json=list_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:list-tools response: {data}")
-        assert "result" in data
-        assert "tools" in data["result"]
-
-        # Test mcp:call-tool
-        call_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "mcp:call-tool",
-            "params": {
-                "name": "get_books_count",
-                "arguments": {}
-            }
-        }
+    logger.debug("✅ %s endpoint MCP-standard methods test passed", name)
 
-        response = await client.post(f"{BASE_URL}/poll", json=call_request)
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"mcp:call-tool response: {data}")
-        assert "result" in data
-        assert "content" in data["result"]
+async def test_websocket(websocket, lock: asyncio.Lock):
+    """Test WebSocket endpoint with MCP-standard methods."""
+    logger.debug("Testing WebSocket endpoint with MCP-standard methods...")
+
+    # The connection is shared, so each request/response pair holds the lock
+    async with lock:
+        # Send mcp:list-tools and mcp:call-tool as one JSON-RPC batch
+        await websocket.send(BATCH_REQUEST_STR)
+        response = await websocket.recv()
+    check_batch_response(orjson.loads(response))
 
-    logger.info("✅ Long Polling endpoint MCP-standard methods test passed")
+    logger.debug("✅ WebSocket endpoint MCP-standard methods test passed")
 
 async def main():
     """Run all tests."""
     logger.info("🚀 Starting MCP-standard method names tests...")
 
     try:
-        await test_simple_http()
-        await test_websocket()
-        await test_http_stream()
-        await test_long_polling()
+        # The endpoint tests are independent, so every round runs concurrently;
+        # the HTTP ones share one connection pool and the WebSocket ones share
+        # one connection, opened with limits that fit large tool results in a
+        # single frame
+        limits = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+        timeout = httpx.Timeout(10.0, read=60.0)
+        async with httpx.AsyncClient(timeout=timeout, limits=limits) as client, \
+                websockets.connect(WS_URL, max_size=WS_MAX_SIZE, write_limit=WS_WRITE_LIMIT) as websocket:
+            ws_lock = asyncio.Lock()
+            await warmup(client, websocket)
+
+            tasks = [
+                task
+                for _ in range(BENCH_ROUNDS)
+                for task in (
+                    *(test_http_endpoint(client, path, name) for path, name in HTTP_ENDPOINTS),
+                    test_websocket(websocket, ws_lock)
+                )
+            ]
+            # Keep collector pauses out of the timed section
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                await asyncio.gather(*tasks)
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+
+        # Each endpoint test sends two JSON-RPC calls
+        calls = 2 * len(tasks)
+        result_logger.info("⏱️ %d calls in %.3fs (%.1f calls/s)", calls, elapsed, calls / elapsed)
 
         logger.info("🎉 All tests passed! MCP-standard method names are supported on all endpoints.")
 
     except Exception as e:
-        logger.error(f"❌ Test failed: {e}")
+        logger.error("❌ Test failed: %s", e)
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -7,6 +7,11 @@ import asyncio
 import sys
 import os
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
@@ -19,8 +24,7 @@ async def test_tools():
     # Test list_tools
     print("\n1. Testing list_tools():")
     tools = await list_tools()
-    for tool in tools:
-        print(f"   - {tool.name}: {tool.description}")
+    sys.stdout.write("".join(f"   - {tool.name}: {tool.description}\n" for tool in tools))
 
     # Test get_books_count
     print("\n2. Testing get_books_count():")
@@ -30,4 +34,7 @@ async def test_tools():
     print("\n✅ All tests completed successfully!")
 
 if __name__ == "__main__":
-    asyncio.run(test_tools())
+    if uvloop:
+        uvloop.run(test_tools())
+    else:
+        asyncio.run(test_tools())